@@ -0,0 +1,7 @@
+"""
+Estadísticas de seguidores de Instagram.
+
+Módulos: config, log, metrics, debug, counts (parser), cache, store,
+browser, extraction, export y replay. El punto de entrada es
+instagram_followers.py; importar el paquete no tiene efectos secundarios.
+"""
@@ -0,0 +1,225 @@
+"""Pausas humanas, ChromeDriver y el registro adaptativo de selectores."""
+from time import sleep
+import time
+import os
+import json
+import random
+
+from . import config
+from .metrics import metrics
+
+def human_delay(min_seconds=1.0, max_seconds=3.0):
+    """Pausa aleatoria para simular comportamiento humano"""
+    if config.DELAY_SCALE > 0:
+        with metrics.span("delay"):
+            sleep(random.uniform(min_seconds, max_seconds) * config.DELAY_SCALE)
+
+@metrics.timed("typing")
+def type_like_human(element, text):
+    """Escribe texto simulando velocidad humana"""
+    for char in text:
+        element.send_keys(char)
+        sleep(random.uniform(0.05, 0.15))
+
+
+CHROMEDRIVER_CACHE = os.path.join(
+    config.BASE_DIR, "cache", "chromedriver.json"
+)
+
+def resolve_chromedriver_path(logger, refresh=False):
+    """
+    Retorna la ruta de chromedriver sin consultas de red en arranques normales:
+      1. CHROMEDRIVER_PATH del .env
+      2. La ruta cacheada en cache/chromedriver.json, si el archivo sigue
+         existiendo y coincide con CHROMEDRIVER_VERSION (si se fijó)
+      3. webdriver-manager (consulta/descarga por red), y se cachea la ruta
+    """
+    explicit = os.getenv("CHROMEDRIVER_PATH")
+    if explicit:
+        return explicit
+    
+    pinned = os.getenv("CHROMEDRIVER_VERSION") or None
+    if not refresh:
+        try:
+            with open(CHROMEDRIVER_CACHE, encoding='utf-8') as f:
+                cached = json.load(f)
+            if os.path.exists(cached["path"]) and cached.get("version") == pinned:
+                return cached["path"]
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    from webdriver_manager.chrome import ChromeDriverManager
+    logger.debug(f"Resolviendo chromedriver con webdriver-manager (versión: {pinned or 'última'})")
+    path = ChromeDriverManager(driver_version=pinned).install()
+    
+    directory = os.path.dirname(CHROMEDRIVER_CACHE)
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(CHROMEDRIVER_CACHE, 'w', encoding='utf-8') as f:
+        json.dump({"path": path, "version": pinned}, f)
+    return path
+
+@metrics.timed("setup_driver")
+def setup_driver(logger, headless=False):
+    """Configura y retorna un driver de Chrome optimizado"""
+    from selenium import webdriver
+    from selenium.common.exceptions import SessionNotCreatedException
+    from selenium.webdriver.chrome.service import Service
+    options = webdriver.ChromeOptions()
+    
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    
+    options.add_experimental_option("detach", not headless)
+    options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+    options.add_experimental_option('useAutomationExtension', False)
+    
+    try:
+        try:
+            service = Service(resolve_chromedriver_path(logger))
+            driver = webdriver.Chrome(service=service, options=options)
+        except SessionNotCreatedException:
+            # El chromedriver cacheado ya no coincide con el Chrome instalado
+            if os.getenv("CHROMEDRIVER_PATH"):
+                raise
+            logger.warning("⚠ chromedriver cacheado incompatible, actualizando...")
+            service = Service(resolve_chromedriver_path(logger, refresh=True))
+            driver = webdriver.Chrome(service=service, options=options)
+        driver.maximize_window()
+        driver.set_script_timeout(config.PROFILE_WAIT_SECONDS + 5)
+        
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        logger.success("Navegador iniciado")
+        return driver
+    except Exception as e:
+        logger.error(f"Error al iniciar navegador: {str(e)}")
+        raise
+
+# ====================== REGISTRO DE SELECTORES ======================
+# Carrera no bloqueante: retorna [índice, elemento] del primer candidato
+# presente (y clicable si se pide) en un único round trip, o null.
+SELECTOR_RACE_JS = """
+const [candidates, clickable] = arguments;
+for (let i = 0; i < candidates.length; i++) {
+    const [kind, selector] = candidates[i];
+    let el = null;
+    try {
+        el = kind === 'xpath'
+            ? document.evaluate(selector, document, null,
+                  XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : document.querySelector(selector);
+    } catch (e) {
+        continue;
+    }
+    if (!el) continue;
+    if (clickable) {
+        const rect = el.getBoundingClientRect();
+        if (!(rect.width || rect.height) || el.disabled) continue;
+    }
+    return [i, el];
+}
+return null;
+"""
+
+class SelectorRegistry:
+    """
+    Registro de selectores con estadísticas persistentes (aciertos, fallos y
+    latencia) por grupo. Ordena los candidatos por tasa de acierto histórica
+    y primero hace una comprobación no bloqueante de todos a la vez; solo si
+    ninguno está presente espera (una única espera para todo el grupo).
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.timeouts = 0
+        self.stats = {}
+        if path:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.stats = json.load(f)
+            except (OSError, ValueError):
+                pass
+    
+    def _score(self, group, key):
+        entry = self.stats.get(group, {}).get(key)
+        if not entry:
+            return (0.5, 0.0)
+        hits, misses = entry["hits"], entry["misses"]
+        mean_latency = entry["latency"] / hits if hits else float("inf")
+        # Tasa de acierto suavizada (Laplace); a igualdad, el más rápido
+        return ((hits + 1) / (hits + misses + 2), -mean_latency)
+    
+    def order(self, group, keys):
+        """Índices de `keys` ordenados por rendimiento histórico (estable)"""
+        return sorted(range(len(keys)), key=lambda i: self._score(group, keys[i]), reverse=True)
+    
+    def record(self, group, key, hit, latency=0.0):
+        entry = self.stats.setdefault(group, {}).setdefault(
+            key, {"hits": 0, "misses": 0, "latency": 0.0}
+        )
+        if hit:
+            entry["hits"] += 1
+            entry["latency"] += latency
+        else:
+            entry["misses"] += 1
+    
+    def find(self, driver, group, candidates, timeout, clickable=False, names=None):
+        """
+        Busca el primero de `candidates` [(By, selector), ...] presente o
+        clicable. Retorna (elemento, índice en candidates) o (None, None).
+        """
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        keys = names or [selector for _, selector in candidates]
+        order = self.order(group, keys)
+        race_args = [
+            ["xpath" if candidates[i][0] == By.XPATH else "css", candidates[i][1]] for i in order
+        ]
+        
+        def race(d):
+            try:
+                with metrics.span("driver.script"):
+                    return d.execute_script(SELECTOR_RACE_JS, race_args, clickable)
+            except WebDriverException:
+                return None
+        
+        started = time.perf_counter()
+        found = race(driver)
+        if not found and timeout > 0:
+            try:
+                found = WebDriverWait(driver, timeout, poll_frequency=0.25).until(race)
+            except TimeoutException:
+                found = None
+                self.timeouts += 1
+                metrics.incr(f"selector_timeouts.{group}")
+        latency = time.perf_counter() - started
+        metrics.durations[f"selector.{group}"].append(latency)
+        
+        if not found:
+            for i in order:
+                self.record(group, keys[i], False)
+            return None, None
+        
+        position, element = found
+        for i in order[:position]:
+            self.record(group, keys[i], False)
+        self.record(group, keys[order[position]], True, latency)
+        return element, order[position]
+    
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.stats, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+selector_registry = SelectorRegistry(None)  # En memoria hasta init_runtime()
@@ -0,0 +1,106 @@
+"""Caché SQLite de contadores de perfiles."""
+import os
+import time
+import sqlite3
+
+from . import config
+
+class ProfileCache:
+    """
+    Caché persistente (SQLite) de contadores de seguidores por username.
+    Guarda count, timestamp y outcome (ok / not-found / unparsed):
+      - ok: válido durante `ttl` segundos
+      - not-found: caché negativa, válida durante `negative_ttl` segundos
+      - unparsed: se registra pero nunca se sirve (se reintenta)
+    Al superar `max_entries` se eliminan las entradas menos usadas (LRU).
+    """
+    SERVED_OUTCOMES = ("ok", "not-found")
+
+    def __init__(self, path, ttl=24 * 3600, negative_ttl=6 * 3600, max_entries=50000):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                username TEXT PRIMARY KEY,
+                followers INTEGER,
+                outcome TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS profiles_accessed_at ON profiles (accessed_at)"
+        )
+        self._conn.commit()
+    
+    def get(self, username):
+        """Retorna (followers, outcome) si hay una entrada vigente, o None"""
+        row = self._conn.execute(
+            "SELECT followers, outcome, fetched_at FROM profiles WHERE username = ?",
+            (username,),
+        ).fetchone()
+        now = time.time()
+        if row is not None and row[1] in self.SERVED_OUTCOMES:
+            followers, outcome, fetched_at = row
+            ttl = self.ttl if outcome == "ok" else self.negative_ttl
+            if now - fetched_at < ttl:
+                self._conn.execute(
+                    "UPDATE profiles SET accessed_at = ? WHERE username = ?", (now, username)
+                )
+                self._conn.commit()
+                self.hits += 1
+                return followers, outcome
+        self.misses += 1
+        return None
+    
+    def put(self, username, followers, outcome):
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO profiles (username, followers, outcome, fetched_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (username, followers, outcome, now, now),
+        )
+        self._conn.commit()
+    
+    def prune(self):
+        """Elimina las entradas menos usadas por encima de max_entries"""
+        deleted = self._conn.execute(
+            "DELETE FROM profiles WHERE username IN ("
+            "  SELECT username FROM profiles ORDER BY accessed_at DESC LIMIT -1 OFFSET ?"
+            ")",
+            (self.max_entries,),
+        ).rowcount
+        self._conn.commit()
+        return deleted
+    
+    def close(self):
+        self.prune()
+        self._conn.close()
+
+def open_profile_cache(logger):
+    """Abre la caché de perfiles según la configuración del .env (o None si está desactivada)"""
+    if os.getenv("PROFILE_CACHE", "1").lower() not in ("1", "true", "yes"):
+        return None
+    path = os.getenv("PROFILE_CACHE_PATH") or os.path.join(
+        config.BASE_DIR, "cache", "profile_cache.sqlite3"
+    )
+    try:
+        cache = ProfileCache(
+            path,
+            ttl=float(os.getenv("PROFILE_CACHE_TTL_HOURS", "24")) * 3600,
+            negative_ttl=float(os.getenv("PROFILE_CACHE_NEGATIVE_TTL_HOURS", "6")) * 3600,
+            max_entries=int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "50000")),
+        )
+        logger.debug(f"Caché de perfiles: {path}")
+        return cache
+    except Exception as e:
+        logger.warning(f"⚠ Caché de perfiles no disponible: {str(e)}")
+        return None
@@ -0,0 +1,34 @@
+"""Configuración del análisis y carga del .env."""
+import os
+
+# Directorio del proyecto: logs, CSV, cachés y results.sqlite3 se guardan aquí
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+count = 50  # Número de seguidores a analizar
+account = "teeli__peachmuffin"  # Cuenta objetivo
+page = "followers"  # "followers" o "following"
+INSTAGRAM_URL = "https://www.instagram.com"  # El modo replay lo apunta a un servidor local
+DELAY_SCALE = 1.0  # 0 desactiva las pausas (replay/benchmarks); HUMAN_DELAY_SCALE en .env
+PROFILE_WAIT_SECONDS = 8  # Espera máxima a que el perfil muestre el contador
+
+# Credenciales: se leen del .env en load_config() (SIN valores por defecto)
+yourusername = None
+yourpassword = None
+
+def load_config(require_credentials=True):
+    """Carga el .env y valida las credenciales (solo al ejecutar el script)"""
+    global yourusername, yourpassword, DELAY_SCALE
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    DELAY_SCALE = float(os.getenv("HUMAN_DELAY_SCALE", "1"))
+    yourusername = os.getenv("IG_USERNAME")
+    yourpassword = os.getenv("IG_PASSWORD")
+    
+    # Validar que las credenciales existan
+    if require_credentials and (not yourusername or not yourpassword):
+        print("❌ ERROR: Credenciales no configuradas")
+        print("Por favor, crea un archivo .env con:")
+        print("IG_USERNAME=tu_usuario")
+        print("IG_PASSWORD=tu_contraseña")
+        exit(1)
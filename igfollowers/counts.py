@@ -0,0 +1,225 @@
+"""Parser de contadores de seguidores ("1,234", "12.5K", "1,2 mil"...)."""
+import re
+import time
+
+# Sufijos multiplicadores (es/en/pt). Se ordenan de mayor a menor longitud
+# para que "millones" gane a "mil" y "mil" gane a "m".
+COUNT_SUFFIXES = {
+    'k': 1_000,
+    'mil': 1_000,
+    'm': 1_000_000,
+    'mi': 1_000_000,
+    'mln': 1_000_000,
+    'mill': 1_000_000,
+    'millón': 1_000_000,
+    'millon': 1_000_000,
+    'millones': 1_000_000,
+    'b': 1_000_000_000,
+    'bn': 1_000_000_000,
+}
+
+_SUFFIX_PATTERN = '|'.join(
+    re.escape(s) for s in sorted(COUNT_SUFFIXES, key=len, reverse=True)
+)
+# Número: dígitos con separadores "." / "," o espacios (normales, duros o finos)
+# entre grupos de 3 dígitos. Nunca cruza saltos de línea.
+_NUMBER_PATTERN = r'\d+(?:[.,]\d+|[ \u00a0\u202f]\d{3}(?!\d))*'
+_COUNT_BODY = (
+    rf'(?P<num>{_NUMBER_PATTERN})'
+    rf'(?:[ \t\u00a0\u202f]*(?P<suffix>{_SUFFIX_PATTERN})\b\.?)?'
+)
+# "1,234 followers", "12,5 mil seguidores", "3M followers"
+_LABELED_COUNT_RE = re.compile(
+    _COUNT_BODY
+    + r'[ \t\u00a0\u202f]*(?:de[ \t\u00a0\u202f]+)?(?:followers?|seguidor(?:es)?)\b',
+    re.IGNORECASE,
+)
+# Primer número de un texto, con cualquier etiqueta
+_ANY_COUNT_RE = re.compile(_COUNT_BODY, re.IGNORECASE)
+# Texto que es solo el número (p. ej. el atributo title: "1,234")
+_BARE_COUNT_RE = re.compile(r'\s*' + _COUNT_BODY + r'\s*', re.IGNORECASE)
+
+
+def _count_from_match(match):
+    """Convierte un match del parser en entero respetando locale y sufijo"""
+    num_str = match.group('num')
+    for space in (' ', '\u00a0', '\u202f'):
+        num_str = num_str.replace(space, '')
+    suffix = match.group('suffix')
+    multiplier = COUNT_SUFFIXES[suffix.lower()] if suffix else 1
+
+    if '.' in num_str and ',' in num_str:
+        # El último separador es el decimal: "1,234.5" / "1.234,5"
+        decimal_sep = '.' if num_str.rfind('.') > num_str.rfind(',') else ','
+        thousands_sep = ',' if decimal_sep == '.' else '.'
+        num_str = num_str.replace(thousands_sep, '').replace(decimal_sep, '.')
+    elif '.' in num_str or ',' in num_str:
+        sep = '.' if '.' in num_str else ','
+        integer, _, fraction = num_str.rpartition(sep)
+        # Un separador seguido de exactamente 3 dígitos es de miles sin sufijo
+        # ("1,234") y también con k/mil ("1,000K", "1.234 mil"): Instagram no
+        # abrevia a miles un número que muestra con precisión de unidades.
+        # Con M/B sí es decimal ("1.234M").
+        thousands = len(fraction) == 3 and multiplier <= 1_000
+        if num_str.count(sep) > 1 or thousands:
+            # Separador de miles: "1,234", "1.234", "1,234,567", "1,000K"
+            num_str = num_str.replace(sep, '')
+        else:
+            # Separador decimal: "12.5K", "1,2 mil"
+            num_str = f"{integer}.{fraction}"
+
+    try:
+        return int(round(float(num_str) * multiplier))
+    except ValueError:
+        return None
+
+
+def parse_follower_count(text):
+    """
+    Extrae el número de seguidores de un texto
+    Ejemplos: "1,234 followers" -> 1234
+              "1.234 seguidores" -> 1234
+              "1,2 mil seguidores" -> 1200
+              "12.5K followers" -> 12500
+              "3M followers" -> 3000000
+              "1,234" (atributo title) -> 1234
+    """
+    if not text:
+        return None
+
+    match = _LABELED_COUNT_RE.search(text) or _BARE_COUNT_RE.fullmatch(text)
+    if not match:
+        return None
+    return _count_from_match(match)
+
+
+def parse_count(text):
+    """Primer contador de un texto con cualquier etiqueta ("123 posts", "1,2 mil seguidos")"""
+    if not text:
+        return None
+    match = _ANY_COUNT_RE.search(text)
+    return _count_from_match(match) if match else None
+
+
+def parse_follower_counts(texts):
+    """Versión por lotes de parse_follower_count: una lista de resultados por texto"""
+    return [parse_follower_count(text) for text in texts]
+
+
+def find_follower_count(page_text):
+    """
+    Busca el primer contador de seguidores en un texto multilínea
+    (p. ej. el texto completo del body) en una sola pasada del regex,
+    sin partirlo en líneas.
+    """
+    if not page_text:
+        return None
+
+    for match in _LABELED_COUNT_RE.finditer(page_text):
+        count = _count_from_match(match)
+        if count is not None:
+            return count
+    return None
+
+
+def find_follower_counts(pages):
+    """Versión por lotes de find_follower_count para varias páginas"""
+    return [find_follower_count(page_text) for page_text in pages]
+
+
+# Textos representativos para el micro-benchmark (el corpus con los
+# resultados esperados está en tests/test_parser.py)
+BENCHMARK_TEXTS = [
+    "1,234 followers",
+    "1.234.567 seguidores",
+    "12,5 mil seguidores",
+    "12.5K followers",
+    "2,5 millones de seguidores",
+    "1\u00a0234 followers",
+    "mike_k 150 followers",
+    "1,234",
+    "Posts 1,234 following",
+    "",
+]
+
+
+# Implementación anterior (regex compilado en cada llamada y búsqueda línea a
+# línea en el body), solo como referencia del benchmark. Sus llamadores
+# capturaban el ValueError de "1,234,567"; aquí se retorna None.
+def _legacy_parse_follower_count(text):
+    if not text:
+        return None
+    
+    text = text.lower().strip()
+    
+    patterns = [
+        r'([\d,\.]+)\s*m\s*followers?',  # Millones
+        r'([\d,\.]+)\s*k\s*followers?',  # Miles
+        r'([\d,\.]+)\s*followers?',      # Número normal
+    ]
+    
+    try:
+        for pattern in patterns:
+            match = re.search(pattern, text)
+            if match:
+                num_str = match.group(1).replace(',', '.')
+                num = float(num_str)
+                
+                if 'm' in text:
+                    return int(num * 1000000)
+                elif 'k' in text:
+                    return int(num * 1000)
+                else:
+                    return int(num)
+    except ValueError:
+        return None
+    
+    return None
+
+
+def _legacy_find_follower_count(page_text):
+    if "followers" in page_text.lower():
+        for line in page_text.split('\n'):
+            if "follower" in line.lower():
+                count = _legacy_parse_follower_count(line)
+                if count is not None:
+                    return count
+    return None
+
+
+def _per_call_us(func, args, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(*args)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def benchmark_parser(iterations=2000, logger=None):
+    """
+    Micro-benchmark del parser de contadores sobre BENCHMARK_TEXTS: coste por
+    texto individual y por página completa (find_follower_count), comparado
+    con la implementación anterior.
+    Retorna {"per_text_us", "per_page_us", "legacy_per_text_us", "legacy_per_page_us"}.
+    """
+    out = logger.log if logger else print
+
+    texts = BENCHMARK_TEXTS
+    page_text = "\n".join(texts)
+
+    def legacy_batch(texts):
+        return [_legacy_parse_follower_count(text) for text in texts]
+
+    result = {
+        "per_text_us": _per_call_us(parse_follower_counts, (texts,), iterations) / len(texts),
+        "legacy_per_text_us": _per_call_us(legacy_batch, (texts,), iterations) / len(texts),
+        "per_page_us": _per_call_us(find_follower_count, (page_text,), iterations),
+        "legacy_per_page_us": _per_call_us(_legacy_find_follower_count, (page_text,), iterations),
+    }
+    out(f"parse_follower_count: {result['per_text_us']:.2f} µs/texto "
+        f"(anterior {result['legacy_per_text_us']:.2f}, "
+        f"x{result['legacy_per_text_us'] / result['per_text_us']:.2f}; {iterations} iteraciones)")
+    out(f"find_follower_count: {result['per_page_us']:.2f} µs/página "
+        f"(anterior {result['legacy_per_page_us']:.2f}, "
+        f"x{result['legacy_per_page_us'] / result['per_page_us']:.2f}; {len(texts)} líneas)")
+
+    return result
@@ -0,0 +1,105 @@
+"""Capturas de debug (screenshot + HTML) según DEBUG_CAPTURE."""
+import os
+import gzip
+import queue
+import threading
+import atexit
+import collections
+
+DEBUG_CAPTURE_LEVELS = ("off", "on-error", "full")
+
+class DebugCapture:
+    """
+    Captura de screenshots/HTML por niveles:
+      - off: no captura nada
+      - on-error: en los puntos normales solo guarda el HTML en un buffer
+        circular en memoria (sin screenshot ni disco); ante un error vuelca
+        el buffer y una captura completa a disco
+      - full: captura completa (screenshot + HTML) en cada punto
+    La escritura y la compresión se hacen en un hilo en segundo plano.
+    """
+    _STOP = object()
+
+    def __init__(self, logger, level="on-error", ring_size=5, compress=True):
+        if level not in DEBUG_CAPTURE_LEVELS:
+            raise ValueError(f"Nivel de captura inválido: {level}")
+        self.logger = logger
+        self.level = level
+        self.compress = compress
+        self._ring = collections.deque(maxlen=ring_size)
+        self._queue = queue.Queue()
+        self._closed = False
+        self._writer = None
+        if level != "off":
+            self._writer = threading.Thread(target=self._writer_loop, name="debug-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+    
+    def capture(self, driver, name, error=False):
+        """Registra un punto de captura; retorna True si se tomó algo"""
+        if self.level == "off" or self._closed:
+            return False
+        
+        if self.level == "on-error" and not error:
+            self._ring.append((name, driver.page_source))
+            return True
+        
+        if error:
+            # Prefijo con el orden para reconstruir la secuencia previa al error
+            for i, (ring_name, html) in enumerate(self._ring, 1):
+                self._queue.put((f"ring{i:02d}_{ring_name}", None, html))
+            self._ring.clear()
+        
+        self._queue.put((name, driver.get_screenshot_as_png(), driver.page_source))
+        return True
+    
+    def flush(self):
+        if self._writer and not self._closed:
+            self._queue.join()
+    
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer:
+            self._queue.put(self._STOP)
+            self._writer.join()
+    
+    def _write_snapshot(self, name, png, html):
+        base = os.path.join(self.logger.logs_dir, f"{name}_{self.logger.timestamp}")
+        if png is not None:
+            with open(base + ".png", 'wb') as f:
+                f.write(png)
+            self.logger.debug(f"Screenshot: {base}.png")
+        
+        data = html.encode('utf-8')
+        if self.compress:
+            html_path = base + ".html.gz"
+            data = gzip.compress(data, compresslevel=6)
+        else:
+            html_path = base + ".html"
+        with open(html_path, 'wb') as f:
+            f.write(data)
+        self.logger.debug(f"HTML: {html_path}")
+    
+    def _writer_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is self._STOP:
+                    return
+                self._write_snapshot(*item)
+            except Exception as e:
+                self.logger.error(f"Error guardando debug: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+debug_capture = DebugCapture(None, level="off")  # init_runtime() aplica la configuración
+
+def save_debug_info(driver, name, logger, error=False):
+    """Guarda screenshot y HTML para debugging según el nivel de captura"""
+    try:
+        return debug_capture.capture(driver, name, error=error)
+    except Exception as e:
+        logger.error(f"Error guardando debug: {str(e)}")
+        return False
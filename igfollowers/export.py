@@ -0,0 +1,223 @@
+"""Exportación en una sola pasada a CSV, TXT, JSONL y Parquet."""
+import os
+import csv
+import json
+import gzip
+import datetime
+import itertools
+
+from . import config
+from .metrics import metrics
+from .store import open_results_store
+
+EXPORT_HEADER = ['Username', 'Username_Follower', 'Num_Followers']
+EXPORT_FORMATS = ("csv", "txt", "jsonl", "parquet")
+
+def _open_text(path, compress, newline=None):
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline=newline)
+    return open(path, 'w', encoding='utf-8', newline=newline)
+
+class CsvSink:
+    extension = ".csv"
+    
+    def __init__(self, path, compress=False):
+        self.path = path
+        self._f = _open_text(path, compress, newline='')
+        self._writer = csv.writer(self._f)
+        self._writer.writerow(EXPORT_HEADER)
+    
+    def write(self, row):
+        self._writer.writerow(row)
+    
+    def close(self):
+        self._f.close()
+
+class JsonlSink:
+    extension = ".jsonl"
+    
+    def __init__(self, path, compress=False):
+        self.path = path
+        self._f = _open_text(path, compress)
+    
+    def write(self, row):
+        self._f.write(json.dumps(dict(zip(EXPORT_HEADER, row)), ensure_ascii=False) + "\n")
+    
+    def close(self):
+        self._f.close()
+
+class TxtSink:
+    """Tabla de texto; los anchos de columna vienen de txt_column_widths()"""
+    extension = ".txt"
+    
+    def __init__(self, path, compress=False, account_name="", widths=(20, 25, 15)):
+        self.path = path
+        self.widths = widths
+        self._f = _open_text(path, compress)
+        w_user, w_follower, w_num = widths
+        # Ancho de la tabla: columnas más los dos separadores " | "
+        banner = '=' * (sum(widths) + 6)
+        self._f.write(f"{banner}\n")
+        self._f.write(f"ANÁLISIS DE SEGUIDORES - {account_name}\n")
+        self._f.write(f"Fecha: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self._f.write(f"{banner}\n\n")
+        self._f.write(f"{'Username':<{w_user}} | {'Follower':<{w_follower}} | {'Num Seguidores':>{w_num}}\n")
+        self._f.write(f"{'-'*w_user}-+-{'-'*w_follower}-+-{'-'*w_num}\n")
+    
+    def write(self, row):
+        username, follower, num_followers = row
+        w_user, w_follower, w_num = self.widths
+        follower_str = str(follower) if follower else "N/A"
+        num_str = f"{num_followers:,}" if num_followers is not None else "N/A"
+        self._f.write(f"{username:<{w_user}} | {follower_str:<{w_follower}} | {num_str:>{w_num}}\n")
+    
+    def close(self):
+        self._f.close()
+
+class ParquetSink:
+    """Columnar (Parquet) por lotes; requiere pyarrow (opcional)"""
+    extension = ".parquet"
+    
+    def __init__(self, path, compress=False, batch_size=10000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.path = path
+        self._pa = pa
+        self._schema = pa.schema([
+            (EXPORT_HEADER[0], pa.string()),
+            (EXPORT_HEADER[1], pa.string()),
+            (EXPORT_HEADER[2], pa.int64()),
+        ])
+        # Parquet ya comprime por columnas: `compress` no aplica
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._batch_size = batch_size
+        self._columns = ([], [], [])
+    
+    def write(self, row):
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        if len(self._columns[0]) >= self._batch_size:
+            self._flush()
+    
+    def _flush(self):
+        if self._columns[0]:
+            self._writer.write_table(
+                self._pa.Table.from_arrays(
+                    [self._pa.array(c, type=f.type) for c, f in zip(self._columns, self._schema)],
+                    schema=self._schema,
+                )
+            )
+            self._columns = ([], [], [])
+    
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+EXPORT_SINKS = {"csv": CsvSink, "txt": TxtSink, "jsonl": JsonlSink, "parquet": ParquetSink}
+
+def txt_column_widths(rows, limit=1000, minimum=(20, 25, 15)):
+    """
+    Calcula los anchos de la tabla TXT sobre como mucho `limit` filas.
+    Retorna (anchos, filas) donde `filas` vuelve a producir todas las filas
+    (las ya leídas y el resto del iterador), así el export sigue en una pasada.
+    """
+    rows = iter(rows)
+    head = list(itertools.islice(rows, limit))
+    widths = list(minimum)
+    for username, follower, num_followers in head:
+        widths[0] = max(widths[0], len(str(username)))
+        widths[1] = max(widths[1], len(str(follower)) if follower else 3)
+        widths[2] = max(widths[2], len(f"{num_followers:,}") if num_followers is not None else 3)
+    return tuple(widths), itertools.chain(head, rows)
+
+def export_rows(rows, base_path, account_name, formats=("csv", "txt"), compress=False):
+    """
+    Exporta un iterador de filas [account, follower, num_followers] a varios
+    formatos en una sola pasada. Retorna (paths, errors): {formato: ruta} de
+    los que se completaron y {formato: mensaje} de los omitidos o fallidos,
+    para que el llamador los reporte.
+    """
+    sinks = {}
+    errors = {}
+    if "txt" in formats:
+        widths, rows = txt_column_widths(rows)
+    for fmt in formats:
+        sink_class = EXPORT_SINKS[fmt]
+        path = base_path + sink_class.extension + (".gz" if compress and fmt != "parquet" else "")
+        kwargs = {"account_name": account_name, "widths": widths} if fmt == "txt" else {}
+        try:
+            sinks[fmt] = sink_class(path, compress=compress, **kwargs)
+        except ImportError:
+            errors[fmt] = "pyarrow no está instalado, se omite"
+        except Exception as e:
+            errors[fmt] = str(e)
+    
+    for row in rows:
+        for fmt, sink in sinks.items():
+            if fmt in errors:
+                continue
+            try:
+                sink.write(row)
+            except Exception as e:
+                errors[fmt] = str(e)
+    
+    paths = {}
+    for fmt, sink in sinks.items():
+        try:
+            sink.close()
+        except Exception as e:
+            errors.setdefault(fmt, str(e))
+        if fmt not in errors:
+            paths[fmt] = sink.path
+    return paths, errors
+
+def report_export_errors(errors, logger):
+    for fmt, message in errors.items():
+        logger.error(f"Error {fmt.upper()}: {message}")
+
+def results_base_path(account_name, timestamp):
+    """Ruta sin extensión de los resultados de una ejecución: {account}_followers_stats_{timestamp}"""
+    return os.path.join(config.BASE_DIR, f"{account_name}_followers_stats_{timestamp}")
+
+def export_run(run_id, formats, compress, output, logger):
+    """Exporta una ejecución del almacén de resultados (subcomando `export`)"""
+    store = open_results_store()
+    try:
+        info = store.run_info(run_id)
+        if info is None:
+            logger.error(f"❌ No existe la ejecución {run_id or '(ninguna)'}")
+            return False
+        run_id, run_account, _ = info
+        base_path = output or results_base_path(run_account, run_id)
+        paths, errors = export_rows(store.rows(run_id), base_path, run_account,
+                                    formats=formats, compress=compress)
+        report_export_errors(errors, logger)
+        for fmt, path in paths.items():
+            logger.success(f"{fmt.upper()}: {path}")
+        return len(paths) == len(formats)
+    finally:
+        store.close()
+
+def export_formats_from_env():
+    formats = [f.strip().lower() for f in os.getenv("EXPORT_FORMATS", "csv,txt").split(",") if f.strip()]
+    return tuple(f for f in formats if f in EXPORT_SINKS)
+
+@metrics.timed("export")
+def save_results(data, base_path, account_name, logger):
+    """
+    Guarda los resultados en base_path + extensión (CSV y TXT por defecto;
+    EXPORT_FORMATS en el .env). `data` es cualquier iterable de filas, p. ej.
+    ResultsStore.rows, y se recorre una sola vez.
+    """
+    paths, errors = export_rows(
+        data,
+        base_path,
+        account_name,
+        formats=export_formats_from_env(),
+        compress=os.getenv("EXPORT_GZIP", "").lower() in ("1", "true", "yes"),
+    )
+    report_export_errors(errors, logger)
+    icons = {"csv": "📊", "txt": "📄", "jsonl": "🧾", "parquet": "🧱"}
+    for fmt, path in paths.items():
+        logger.success(f"{icons[fmt]} {fmt.upper()}: {path}")
+    return paths
@@ -0,0 +1,559 @@
+"""Login, perfiles y listas de seguidores en Instagram."""
+import urllib.parse
+
+from . import config, browser
+from .browser import human_delay, type_like_human
+from .counts import parse_follower_count, parse_count, find_follower_count
+from .debug import save_debug_info
+from .metrics import metrics
+
+def username_from_href(href):
+    """
+    Extrae el username de un enlace de perfil ("https://www.instagram.com/user/",
+    "/user/" o la misma ruta bajo INSTAGRAM_URL). Retorna None para enlaces externos.
+    """
+    if not href:
+        return None
+    parts = urllib.parse.urlsplit(href)
+    if parts.netloc and parts.netloc not in (
+        "www.instagram.com", "instagram.com", urllib.parse.urlsplit(config.INSTAGRAM_URL).netloc
+    ):
+        return None
+    segments = [segment for segment in parts.path.split('/') if segment]
+    return segments[0] if segments else None
+
+
+@metrics.timed("cookies")
+def handle_cookies(driver, logger):
+    """Maneja diálogos de cookies con múltiples estrategias"""
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.common.by import By
+    logger.debug("Buscando diálogos de cookies...")
+    
+    cookie_selectors = [
+        (By.XPATH, "//button[contains(text(),'Allow essential and optional cookies')]"),
+        (By.XPATH, "//button[contains(text(),'Accept')]"),
+        (By.XPATH, "//button[contains(text(),'Accept All')]"),
+        (By.XPATH, "//button[contains(text(),'Aceptar')]"),
+        (By.XPATH, "//button[contains(text(), 'Allow all cookies')]"),
+        (By.CSS_SELECTOR, "button._a9--._a9_1"),
+    ]
+    
+    cookie_button, index = browser.selector_registry.find(
+        driver, "cookies", cookie_selectors, timeout=5, clickable=True
+    )
+    if cookie_button is not None:
+        try:
+            cookie_button.click()
+            logger.success(f"✓ Cookies aceptadas: {cookie_selectors[index][1]}")
+            human_delay(1, 2)
+            return True
+        except WebDriverException as e:
+            logger.debug(f"No se pudo pulsar el botón de cookies: {str(e)}")
+    
+    logger.debug("No se encontraron diálogos de cookies (puede ser normal)")
+    return False
+
+def find_login_fields(driver, strategies, logger):
+    """Busca los campos de usuario y contraseña; retorna (username_input, password_input)"""
+    from selenium.common.exceptions import NoSuchElementException
+    remaining = list(strategies)
+    while remaining:
+        username_input, index = browser.selector_registry.find(
+            driver, "login_fields", [s['username'] for s in remaining], timeout=10,
+            names=[s['name'] for s in remaining],
+        )
+        if username_input is None:
+            logger.debug("   ✗ Ninguna estrategia encontró los campos")
+            break
+        strategy = remaining.pop(index)
+        try:
+            password_input = driver.find_element(*strategy['password'])
+            logger.success(f"   ✓ Campos encontrados con: {strategy['name']}")
+            return username_input, password_input
+        except NoSuchElementException:
+            logger.debug(f"   ✗ {strategy['name']}: campo de contraseña no encontrado")
+            browser.selector_registry.record("login_fields", strategy['name'], False)
+    return None, None
+
+@metrics.timed("login")
+def login_instagram_robust(driver, username, password, logger):
+    """Login con múltiples estrategias y mejor manejo de errores"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    try:
+        logger.log("="*60)
+        logger.log("PROCESO DE LOGIN")
+        logger.log("="*60)
+        
+        # Ir a Instagram
+        logger.log("1. Navegando a Instagram...")
+        with metrics.span("driver.get"):
+            driver.get(f'{config.INSTAGRAM_URL}/')
+        human_delay(5, 7)
+        
+        save_debug_info(driver, "step1_homepage", logger)
+        
+        # Manejar cookies
+        logger.log("2. Manejando cookies...")
+        handle_cookies(driver, logger)
+        human_delay(2, 3)
+        
+        # Buscar campos de login con múltiples estrategias
+        logger.log("3. Buscando campos de login...")
+        
+        strategies = [
+            {
+                "name": "Por atributo 'name'",
+                "username": (By.CSS_SELECTOR, "input[name='username']"),
+                "password": (By.CSS_SELECTOR, "input[name='password']")
+            },
+            {
+                "name": "Por atributo 'aria-label'",
+                "username": (By.CSS_SELECTOR, "input[aria-label*='username' i]"),
+                "password": (By.CSS_SELECTOR, "input[aria-label*='password' i]")
+            },
+            {
+                "name": "Por tipo de input",
+                "username": (By.CSS_SELECTOR, "input[type='text']"),
+                "password": (By.CSS_SELECTOR, "input[type='password']")
+            }
+        ]
+        
+        username_input, password_input = find_login_fields(driver, strategies, logger)
+        
+        if not username_input or not password_input:
+            logger.error("❌ No se encontraron campos de login")
+            save_debug_info(driver, "login_fields_not_found", logger, error=True)
+            
+            # Intentar ir directamente a /accounts/login/
+            logger.log("4. Intentando ir a página de login directamente...")
+            with metrics.span("driver.get"):
+                driver.get(f'{config.INSTAGRAM_URL}/accounts/login/')
+            human_delay(5, 7)
+            
+            handle_cookies(driver, logger)
+            save_debug_info(driver, "step2_login_page", logger)
+            
+            # Reintentar búsqueda de campos
+            username_input, password_input = find_login_fields(driver, strategies, logger)
+            
+            if not username_input or not password_input:
+                logger.error("❌ FALLO CRÍTICO: No se pueden encontrar campos de login")
+                logger.log("Revisa los screenshots generados para ver qué está mostrando Instagram")
+                return False
+        
+        # Limpiar campos por si tienen contenido
+        logger.log("4. Limpiando campos...")
+        username_input.clear()
+        password_input.clear()
+        human_delay(1, 2)
+        
+        # Escribir credenciales
+        logger.log("5. Ingresando credenciales...")
+        logger.debug(f"   Username: {username}")
+        type_like_human(username_input, username)
+        human_delay(0.5, 1)
+        
+        type_like_human(password_input, password)
+        logger.debug("   Password: ********")
+        human_delay(1, 2)
+        
+        save_debug_info(driver, "step3_credentials_entered", logger)
+        
+        # Buscar y hacer clic en botón de login
+        logger.log("6. Buscando botón de login...")
+        
+        button_selectors = [
+            (By.XPATH, "//button[@type='submit']"),
+            (By.XPATH, "//button[contains(text(), 'Log in')]"),
+            (By.XPATH, "//button[contains(text(), 'Log In')]"),
+            (By.CSS_SELECTOR, "button[type='submit']"),
+        ]
+        
+        login_button, index = browser.selector_registry.find(
+            driver, "login_button", button_selectors, timeout=5, clickable=True
+        )
+        if login_button is not None:
+            logger.success(f"   ✓ Botón encontrado: {button_selectors[index][1]}")
+        
+        if not login_button:
+            logger.error("❌ No se encontró botón de login")
+            # Intentar presionar Enter en el campo de password
+            logger.log("   Intentando con tecla Enter...")
+            password_input.send_keys(Keys.RETURN)
+        else:
+            login_button.click()
+        
+        logger.log("7. Esperando respuesta del servidor...")
+        human_delay(10, 15)  # Espera más larga
+        
+        save_debug_info(driver, "step4_after_login_click", logger)
+        
+        # Verificar si el login fue exitoso
+        logger.log("8. Verificando login...")
+        
+        success_indicators = [
+            (By.XPATH, "//input[@placeholder='Search' or @aria-label='Search input']"),
+            (By.XPATH, "//svg[@aria-label='Home']"),
+            (By.XPATH, "//a[@href='/']//svg"),
+            (By.XPATH, "//*[contains(@aria-label, 'Home')]"),
+        ]
+        
+        element, index = browser.selector_registry.find(
+            driver, "login_success", success_indicators, timeout=10
+        )
+        login_success = element is not None
+        if login_success:
+            logger.success(f"✓ Login exitoso! (indicador: {success_indicators[index][1]})")
+        
+        if not login_success:
+            # Verificar si hay errores de login
+            error_selectors = [
+                (By.XPATH, "//*[contains(text(), 'Sorry')]"),
+                (By.XPATH, "//*[contains(text(), 'incorrect')]"),
+                (By.XPATH, "//*[contains(text(), 'wrong')]"),
+                (By.XPATH, "//p[@role='alert']"),
+            ]
+            
+            error_element, _ = browser.selector_registry.find(
+                driver, "login_error", error_selectors, timeout=0
+            )
+            if error_element is not None:
+                logger.error(f"❌ Error de login detectado: {error_element.text}")
+                save_debug_info(driver, "login_error_detected", logger, error=True)
+                return False
+            
+            # Si no hay error pero tampoco indicadores de éxito
+            logger.warning("⚠ No se pudo verificar el login definitivamente")
+            logger.log("   Continuando de todos modos...")
+            save_debug_info(driver, "login_uncertain", logger, error=True)
+        
+        logger.log("="*60)
+        return True
+        
+    except Exception as e:
+        logger.error(f"❌ Error durante login: {str(e)}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        save_debug_info(driver, "login_exception", logger, error=True)
+        return False
+
+@metrics.timed("post_login_dialogs")
+def handle_post_login_dialogs(driver, logger):
+    """Maneja diálogos post-login"""
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.common.by import By
+    logger.log("Manejando diálogos post-login...")
+    
+    dialog_buttons = [
+        (By.XPATH, "//button[contains(text(),'Not Now')]"),
+        (By.XPATH, "//button[contains(text(),'Ahora no')]"),
+        (By.XPATH, "//button[contains(text(),'Not now')]"),
+    ]
+    
+    dialogs_closed = 0
+    for attempt in range(3):
+        human_delay(2, 3)
+        button, _ = browser.selector_registry.find(
+            driver, "post_login_dialog", dialog_buttons, timeout=5, clickable=True
+        )
+        if button is None:
+            break
+        try:
+            button.click()
+        except WebDriverException:
+            break
+        logger.success(f"✓ Diálogo cerrado (#{dialogs_closed + 1})")
+        dialogs_closed += 1
+    
+    if dialogs_closed == 0:
+        logger.debug("No se encontraron diálogos post-login")
+
+@metrics.timed("close_modal")
+def close_modal_if_open(driver, logger):
+    """Cierra cualquier modal abierto"""
+    from selenium.common.exceptions import WebDriverException
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    try:
+        close_buttons = [
+            (By.XPATH, "//button[contains(@aria-label, 'Close')]"),
+            (By.XPATH, "//svg[@aria-label='Close']"),
+            (By.XPATH, "//*[name()='svg' and contains(@aria-label, 'Close')]/.."),
+        ]
+        
+        close_btn, _ = browser.selector_registry.find(
+            driver, "close_modal", close_buttons, timeout=2, clickable=True
+        )
+        if close_btn is not None:
+            try:
+                close_btn.click()
+                logger.debug("Modal cerrado")
+                human_delay(1, 2)
+                return True
+            except WebDriverException:
+                pass
+        
+        # Presionar ESC
+        ActionChains(driver).send_keys(Keys.ESCAPE).perform()
+        human_delay(1, 2)
+        return True
+        
+    except Exception as e:
+        return False
+
+@metrics.timed("profile")
+def get_follower_count_from_profile(driver, username, logger, cache=None):
+    """
+    Navega al perfil de un usuario y obtiene su número de seguidores.
+    Si se pasa un ProfileCache, guarda el resultado (ok/not-found/unparsed).
+    """
+    follower_count, outcome = _fetch_follower_count(driver, username, logger)
+    if cache is not None and outcome != "error":
+        cache.put(username, follower_count, outcome)
+    return follower_count
+
+# Script inyectado: espera dentro de la página (sin round trips extra) a que
+# aparezca el enlace de seguidores o el "Sorry" y retorna todo en un objeto.
+PROFILE_EXTRACT_JS = """
+const [username, timeoutMs, done] = arguments;
+const started = Date.now();
+const text = (el) => el ? el.innerText : null;
+const title = (el) => el ? (el.getAttribute('title') ||
+    (el.querySelector('[title]') || {title: null}).title) : null;
+function findLink(links, kind) {
+    return links.find(a => a.getAttribute('href').includes('/' + username + '/' + kind + '/')) ||
+           links.find(a => a.getAttribute('href').includes('/' + kind + '/'));
+}
+function snapshot(timedOut) {
+    const sorry = Array.from(document.querySelectorAll('h2'))
+        .some(h => h.textContent.includes('Sorry'));
+    if (sorry) return {exists: false};
+    const links = Array.from(document.querySelectorAll('a[href]'));
+    const followers = findLink(links, 'followers');
+    if (!followers && !timedOut) return null;
+    const following = findLink(links, 'following');
+    // Sin dígitos en el texto ni en el título del enlace no hay nada que
+    // parsear: se envía también el texto del body como alternativa
+    const linkHasCount = followers && /\\d/.test((text(followers) || '') + (title(followers) || ''));
+    const posts = Array.from(document.querySelectorAll('header li'))
+        .find(li => /posts|publicaciones/i.test(li.innerText));
+    return {
+        exists: true,
+        followersText: text(followers),
+        followersTitle: title(followers),
+        followingText: text(following),
+        postsText: text(posts),
+        bodyText: linkHasCount || !document.body ? null : document.body.innerText,
+        timedOut: !followers,
+    };
+}
+(function poll() {
+    const timedOut = Date.now() - started >= timeoutMs;
+    const result = snapshot(timedOut);
+    if (result) done(result); else setTimeout(poll, 100);
+})();
+"""
+
+def extract_profile(driver, username, timeout=config.PROFILE_WAIT_SECONDS):
+    """Extrae los datos crudos del perfil cargado en un único round trip"""
+    with metrics.span("driver.script"):
+        return driver.execute_async_script(PROFILE_EXTRACT_JS, username, int(timeout * 1000))
+
+def parse_profile_snapshot(snapshot):
+    """
+    Convierte el resultado de PROFILE_EXTRACT_JS en
+    {"exists", "followers", "following", "posts", "source"}
+    """
+    if not snapshot or not snapshot.get("exists"):
+        return {"exists": False, "followers": None, "following": None, "posts": None, "source": None}
+    
+    followers, source = None, None
+    for source_name, value in (("link", snapshot.get("followersText")),
+                               ("title", snapshot.get("followersTitle"))):
+        followers = parse_follower_count(value)
+        if followers is not None:
+            source = source_name
+            break
+    else:
+        followers = find_follower_count(snapshot.get("bodyText"))
+        if followers is not None:
+            source = "body"
+    
+    return {
+        "exists": True,
+        "followers": followers,
+        "following": parse_count(snapshot.get("followingText")),
+        "posts": parse_count(snapshot.get("postsText")),
+        "source": source,
+    }
+
+def _fetch_follower_count(driver, username, logger):
+    """Visita el perfil y retorna (seguidores, outcome)"""
+    try:
+        url = f'{config.INSTAGRAM_URL}/{username}/'
+        logger.debug(f"  → Visitando: {username}")
+        
+        with metrics.span("driver.get"):
+            driver.get(url)
+        human_delay(3, 5)
+        
+        snapshot = extract_profile(driver, username)
+        if snapshot.get("timedOut"):
+            # Se agotó la espera del script sin ver el enlace de seguidores
+            metrics.incr("selector_timeouts.profile")
+        profile = parse_profile_snapshot(snapshot)
+        if profile["exists"] and profile["followers"] is None and not snapshot.get("bodyText"):
+            # El enlace tenía dígitos pero no se pudieron parsear: el body como último recurso
+            with metrics.span("driver.script"):
+                snapshot["bodyText"] = driver.execute_script(
+                    "return document.body ? document.body.innerText : null;"
+                )
+            profile = parse_profile_snapshot(snapshot)
+        
+        if not profile["exists"]:
+            logger.warning(f"  ⚠ {username} no existe/privado")
+            return None, "not-found"
+        
+        follower_count = profile["followers"]
+        if follower_count is not None:
+            suffix = " (alternativo)" if profile["source"] == "body" else " seguidores"
+            logger.success(f"  ✓ {username}: {follower_count:,}{suffix}")
+            logger.debug(f"    siguiendo: {profile['following']}, publicaciones: {profile['posts']}")
+            return follower_count, "ok"
+        
+        logger.warning(f"  ⚠ No se pudo obtener seguidores de {username}")
+        return None, "unparsed"
+        
+    except Exception as e:
+        logger.error(f"  ✗ Error en {username}: {str(e)}")
+        return None, "error"
+
+# Script inyectado para la lista: retorna solo los href de los enlaces del
+# modal que no se habían visto y después hace scroll. Cada enlace guarda en
+# data-ig-harvested el href con el que se leyó: la lista virtualizada reutiliza
+# nodos cambiando su href, y un nodo reciclado se vuelve a leer.
+HARVEST_LINKS_JS = """
+const modal = arguments[0];
+const links = document.querySelectorAll("div[role='dialog'] a[href*='/']");
+const hrefs = [];
+for (const link of links) {
+    const href = link.getAttribute('href');
+    if (link.dataset.igHarvested === href) continue;
+    link.dataset.igHarvested = href;
+    hrefs.push(href);
+}
+modal.scrollTop = modal.scrollHeight;
+return hrefs;
+"""
+
+@metrics.timed("followers_list")
+def get_followers_list(driver, account, page_type, target_count, logger):
+    """Obtiene la lista de seguidores"""
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+    try:
+        url = f'{config.INSTAGRAM_URL}/{account}/'
+        logger.log(f"📍 Navegando a: {account}")
+        with metrics.span("driver.get"):
+            driver.get(url)
+        human_delay(5, 7)
+        
+        save_debug_info(driver, "profile_page", logger)
+        
+        # Verificar existencia
+        try:
+            error = driver.find_element(By.XPATH, "//h2[contains(text(), 'Sorry')]")
+            logger.error(f"Cuenta {account} no existe")
+            return []
+        except NoSuchElementException:
+            logger.success("Perfil cargado")
+        
+        # Click en followers
+        logger.log(f"🔍 Buscando {page_type}...")
+        
+        link_selectors = [
+            (By.XPATH, f'//a[contains(@href, "/{page_type}")]'),
+        ]
+        
+        # El registro cuenta la espera agotada en selector_timeouts.list_link
+        link, _ = browser.selector_registry.find(
+            driver, "list_link", link_selectors, timeout=10, clickable=True
+        )
+        if link is not None:
+            logger.success("✓ Enlace encontrado")
+        
+        if not link:
+            logger.error("No se encontró el enlace")
+            return []
+        
+        logger.log("👆 Haciendo clic...")
+        driver.execute_script("arguments[0].click();", link)
+        human_delay(6, 8)
+        
+        save_debug_info(driver, f"modal_{page_type}", logger)
+        
+        # Buscar modal
+        modal_selectors = [
+            (By.CSS_SELECTOR, "div[role='dialog']"),
+            (By.XPATH, "//div[@role='dialog']"),
+        ]
+        
+        modal, _ = browser.selector_registry.find(driver, "modal", modal_selectors, timeout=10)
+        if modal is not None:
+            logger.success("✓ Modal encontrado")
+        
+        if not modal:
+            logger.error("❌ Modal no encontrado")
+            return []
+        
+        # Extraer usuarios
+        logger.log(f"📥 Extrayendo {target_count} usuarios...")
+        
+        followers_list = []
+        scraped = set()
+        stall_count = 0
+        max_stalls = 5
+        
+        while len(followers_list) < target_count and stall_count < max_stalls:
+            # Un solo round trip: enlaces nuevos desde la última pasada + scroll
+            try:
+                with metrics.span("driver.script"):
+                    hrefs = driver.execute_script(HARVEST_LINKS_JS, modal)
+            except Exception:
+                break
+            
+            new_users = 0
+            for href in hrefs:
+                username = username_from_href(href)
+                
+                if username and username not in scraped and username != account:
+                    scraped.add(username)
+                    followers_list.append(username)
+                    new_users += 1
+                    logger.log(f"  [{len(followers_list)}/{target_count}] {username}",
+                               phase="list", username=username)
+                    
+                    if len(followers_list) >= target_count:
+                        break
+            
+            if new_users == 0:
+                stall_count += 1
+            else:
+                stall_count = 0
+            
+            human_delay(2, 3)
+        
+        logger.success(f"✓ Extraídos {len(followers_list)} usuarios")
+        
+        close_modal_if_open(driver, logger)
+        human_delay(2, 3)
+        
+        return followers_list
+        
+    except Exception as e:
+        logger.error(f"Error obteniendo lista: {str(e)}")
+        save_debug_info(driver, "get_followers_error", logger, error=True)
+        return []
@@ -0,0 +1,138 @@
+"""Logger con escritura en segundo plano (texto y JSON Lines)."""
+import os
+import sys
+import json
+import queue
+import threading
+import atexit
+import datetime
+
+from . import config
+
+LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARNING": 30, "ERROR": 40}
+
+class Logger:
+    """
+    Logger con buffer: los mensajes se encolan (cola acotada) y un hilo en
+    segundo plano los imprime y los escribe en disco por lotes, manteniendo
+    el archivo abierto. Opcionalmente escribe también eventos estructurados
+    en JSON Lines (phase, username, latency, outcome...).
+    """
+    _STOP = object()
+
+    def __init__(self, log_dir="logs", level="DEBUG", json_log=False,
+                 queue_size=10000, flush_interval=0.5):
+        self.logs_dir = os.path.join(config.BASE_DIR, log_dir)
+        if not os.path.exists(self.logs_dir):
+            os.makedirs(self.logs_dir)
+        
+        self.timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.log_file = os.path.join(self.logs_dir, f"followers_stats_log_{self.timestamp}.txt")
+        self.json_file = (
+            os.path.join(self.logs_dir, f"followers_stats_log_{self.timestamp}.jsonl")
+            if json_log else None
+        )
+        
+        self.set_level(level)
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._writer = threading.Thread(target=self._writer_loop, name="logger-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+    
+    def set_level(self, level):
+        if level.upper() not in LOG_LEVELS:
+            raise ValueError(f"Nivel de log inválido: {level} (válidos: {', '.join(LOG_LEVELS)})")
+        self.level = LOG_LEVELS[level.upper()]
+        self.debug_enabled = self.level <= LOG_LEVELS["DEBUG"]
+    
+    def is_enabled(self, level):
+        return LOG_LEVELS[level] >= self.level
+    
+    def log(self, message, level="INFO", **fields):
+        if LOG_LEVELS[level] < self.level or self._closed:
+            return
+        now = datetime.datetime.now()
+        formatted_message = f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] [{level}] {message}"
+        record = None
+        if self.json_file:
+            record = {"ts": now.isoformat(timespec='milliseconds'), "level": level, "message": message}
+            record.update(fields)
+        self._queue.put((formatted_message, record))
+    
+    def event(self, phase, level="INFO", **fields):
+        """Evento estructurado solo para el JSON Lines (no se imprime)"""
+        if not self.json_file or LOG_LEVELS[level] < self.level or self._closed:
+            return
+        record = {"ts": datetime.datetime.now().isoformat(timespec='milliseconds'),
+                  "level": level, "phase": phase}
+        record.update(fields)
+        self._queue.put((None, record))
+    
+    def error(self, message, **fields):
+        self.log(message, "ERROR", **fields)
+    
+    def warning(self, message, **fields):
+        self.log(message, "WARNING", **fields)
+    
+    def success(self, message, **fields):
+        self.log(message, "SUCCESS", **fields)
+    
+    def debug(self, message, **fields):
+        if self.debug_enabled:
+            self.log(message, "DEBUG", **fields)
+    
+    def flush(self):
+        """Bloquea hasta que el hilo escritor haya procesado todo lo encolado"""
+        if not self._closed:
+            self._queue.join()
+    
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._writer.join()
+    
+    def _writer_loop(self):
+        text_f = open(self.log_file, 'a', encoding='utf-8')
+        json_f = open(self.json_file, 'a', encoding='utf-8') if self.json_file else None
+        try:
+            stop = False
+            while not stop:
+                try:
+                    batch = [self._queue.get(timeout=self.flush_interval)]
+                except queue.Empty:
+                    continue
+                # Vaciar lo que ya esté en cola para escribirlo en un solo lote
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                lines = []
+                for item in batch:
+                    if item is self._STOP:
+                        stop = True
+                        continue
+                    formatted_message, record = item
+                    if formatted_message is not None:
+                        lines.append(formatted_message)
+                    if json_f and record is not None:
+                        json_f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                if lines:
+                    text = "\n".join(lines) + "\n"
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+                    text_f.write(text)
+                text_f.flush()
+                if json_f:
+                    json_f.flush()
+                for _ in batch:
+                    self._queue.task_done()
+        finally:
+            text_f.close()
+            if json_f:
+                json_f.close()
@@ -0,0 +1,75 @@
+"""Spans de tiempo por fase y el informe metrics_*.json de cada ejecución."""
+import time
+import math
+import json
+import collections
+import contextlib
+import functools
+
+def _percentile(values, pct):
+    """Percentil por rango más cercano: el menor valor con al menos pct% de los datos"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+class RunMetrics:
+    """
+    Instrumentación ligera por fases: spans con duración (p50/p95/max por
+    fase) y contadores (p. ej. esperas de selectores agotadas).
+    """
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Vacía spans y contadores y reinicia el reloj (al empezar cada ejecución)"""
+        self.durations = collections.defaultdict(list)
+        self.counters = collections.Counter()
+        self.started = time.time()
+    
+    @contextlib.contextmanager
+    def span(self, phase):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[phase].append(time.perf_counter() - started)
+    
+    def timed(self, phase):
+        """Decorador: registra cada llamada a la función como un span"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(phase):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def incr(self, name, amount=1):
+        self.counters[name] += amount
+    
+    def summary(self):
+        phases = {}
+        for phase, values in sorted(self.durations.items()):
+            phases[phase] = {
+                "count": len(values),
+                "total": round(sum(values), 4),
+                "p50": round(_percentile(values, 50), 4),
+                "p95": round(_percentile(values, 95), 4),
+                "max": round(max(values), 4),
+            }
+        return {
+            "wall_clock": round(time.time() - self.started, 3),
+            "phases": phases,
+            "counters": dict(sorted(self.counters.items())),
+        }
+    
+    def write(self, path, **extra):
+        report = dict(extra)
+        report.update(self.summary())
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return report
+
+metrics = RunMetrics()
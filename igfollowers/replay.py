@@ -0,0 +1,150 @@
+"""Benchmark offline: sirve snapshots HTML guardados y ejecuta la extracción contra ellos."""
+import os
+import time
+import gzip
+import threading
+import http.server
+import urllib.parse
+
+from . import config
+from .browser import setup_driver
+from .counts import benchmark_parser
+from .extraction import get_follower_count_from_profile, get_followers_list, login_instagram_robust
+from .metrics import _percentile
+
+# Estructura del directorio de fixtures (HTML plano o .html.gz, como los que
+# guarda save_debug_info):
+#   home.html                       -> /  y  /accounts/login/
+#   profiles/<username>.html        -> /<username>/
+#   lists/<account>_<page>.html     -> /<account>/<page>/  (modal con la lista)
+# Cualquier otra ruta responde con la página "Sorry" de perfil inexistente.
+NOT_FOUND_HTML = (
+    "<html><body><h2>Sorry, this page isn't available.</h2></body></html>"
+)
+
+def _read_fixture(path):
+    for candidate in (path + ".html", path + ".html.gz"):
+        if os.path.exists(candidate):
+            with open(candidate, 'rb') as f:
+                data = f.read()
+            return gzip.decompress(data) if candidate.endswith(".gz") else data
+    return None
+
+def fixture_profiles(fixtures_dir):
+    """Usernames con snapshot en profiles/ (solo se quita la extensión: "john.doe.html" -> "john.doe")"""
+    directory = os.path.join(fixtures_dir, "profiles")
+    if not os.path.isdir(directory):
+        return []
+    usernames = set()
+    for name in os.listdir(directory):
+        for suffix in (".html.gz", ".html"):
+            if name.endswith(suffix):
+                usernames.add(name[:-len(suffix)])
+                break
+    return sorted(usernames)
+
+def replay_login(driver, logger):
+    """Ejecuta el login completo contra home.html (credenciales ficticias) y retorna si tuvo éxito"""
+    return login_instagram_robust(driver, "replay_user", "replay_password", logger)
+
+class _FixtureHandler(http.server.BaseHTTPRequestHandler):
+    fixtures_dir = None
+    
+    def do_GET(self):
+        segments = [s for s in urllib.parse.urlsplit(self.path).path.split('/') if s]
+        if not segments or segments[:2] == ["accounts", "login"]:
+            body = _read_fixture(os.path.join(self.fixtures_dir, "home"))
+        elif len(segments) == 1:
+            body = _read_fixture(os.path.join(self.fixtures_dir, "profiles", segments[0]))
+        elif len(segments) == 2:
+            body = _read_fixture(os.path.join(self.fixtures_dir, "lists", f"{segments[0]}_{segments[1]}"))
+        else:
+            body = None
+        
+        self.send_response(200 if body is not None else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(body if body is not None else NOT_FOUND_HTML.encode('utf-8'))
+    
+    def log_message(self, format, *args):
+        pass
+
+class FixtureServer:
+    """Servidor HTTP local que sirve snapshots HTML con las rutas de Instagram"""
+    def __init__(self, fixtures_dir):
+        self.fixtures_dir = os.path.abspath(fixtures_dir)
+        handler = type("FixtureHandler", (_FixtureHandler,), {"fixtures_dir": self.fixtures_dir})
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+    
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def profiles(self):
+        return fixture_profiles(self.fixtures_dir)
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+def run_replay_benchmark(fixtures_dir, logger, target_account=None, page_type="followers",
+                         list_count=100):
+    """
+    Ejecuta la extracción contra fixtures locales en Chrome headless, sin red,
+    y mide el login, la latencia por perfil, el throughput de la lista y el
+    coste del parser. Retorna False si el login de replay falla.
+    """
+    original = (config.INSTAGRAM_URL, config.DELAY_SCALE)
+    driver = None
+    logged_in = False
+    try:
+        with FixtureServer(fixtures_dir) as server:
+            config.INSTAGRAM_URL, config.DELAY_SCALE = server.base_url, 0
+            logger.log(f"🎞 Replay de {server.fixtures_dir} en {server.base_url}")
+            driver = setup_driver(logger, headless=True)
+            
+            started = time.perf_counter()
+            logged_in = replay_login(driver, logger)
+            elapsed = time.perf_counter() - started
+            if logged_in:
+                logger.log(f"Login: {elapsed * 1000:.0f} ms")
+            else:
+                logger.warning("⚠ El login no encontró campos o botón en home.html")
+            
+            latencies = []
+            for username in server.profiles():
+                started = time.perf_counter()
+                get_follower_count_from_profile(driver, username, logger)
+                latencies.append(time.perf_counter() - started)
+            if latencies:
+                logger.log(
+                    f"Perfil: {len(latencies)} perfiles, "
+                    f"p50 {_percentile(latencies, 50) * 1000:.0f} ms, "
+                    f"p95 {_percentile(latencies, 95) * 1000:.0f} ms, "
+                    f"max {max(latencies) * 1000:.0f} ms"
+                )
+            
+            if target_account:
+                started = time.perf_counter()
+                users = get_followers_list(driver, target_account, page_type, list_count, logger)
+                elapsed = time.perf_counter() - started
+                if users:
+                    logger.log(
+                        f"Lista: {len(users)} usuarios en {elapsed:.2f} s "
+                        f"({elapsed / len(users) * 100:.2f} s por 100 usuarios)"
+                    )
+                else:
+                    logger.warning("⚠ La lista no devolvió usuarios")
+    finally:
+        config.INSTAGRAM_URL, config.DELAY_SCALE = original
+        if driver:
+            driver.quit()
+    
+    benchmark_parser(logger=logger)
+    return logged_in
@@ -0,0 +1,277 @@
+"""Almacén SQLite de ejecuciones y resultados (results.sqlite3)."""
+import os
+import re
+import csv
+import sqlite3
+import datetime
+
+from . import config
+
+STATS_CSV_RE = re.compile(r'^(.+)_followers_stats_(\d{8}-\d{6})\.csv$')
+
+class ResultRows:
+    """Vista re-iterable de las filas de una ejecución: cada iteración es una consulta nueva"""
+    def __init__(self, conn, run_id):
+        self._conn = conn
+        self.run_id = run_id
+    
+    def __iter__(self):
+        cursor = self._conn.execute(
+            "SELECT account, username, followers FROM results WHERE run_id = ? ORDER BY seq",
+            (self.run_id,),
+        )
+        for row in cursor:
+            yield list(row)
+
+class ResultsStore:
+    """
+    Almacén incremental de resultados en SQLite (modo WAL). Cada perfil se
+    escribe en cuanto se procesa, así un fallo a mitad de ejecución no pierde
+    lo ya obtenido. Con synchronous=NORMAL los commits no hacen fsync uno a
+    uno: SQLite los agrupa en los checkpoints del WAL.
+    """
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                account TEXT NOT NULL,
+                page TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                finished_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                run_id TEXT NOT NULL REFERENCES runs (run_id),
+                seq INTEGER NOT NULL,
+                account TEXT NOT NULL,
+                username TEXT NOT NULL,
+                followers INTEGER,
+                PRIMARY KEY (run_id, username)
+            );
+            CREATE INDEX IF NOT EXISTS runs_account_page ON runs (account, page, started_at);
+            -- Ninguna consulta lo usaba (diff va por la clave primaria run_id, username)
+            DROP INDEX IF EXISTS results_username;
+            -- Archivos CSV ya asociados a una ejecución (exportados o ingeridos)
+            CREATE TABLE IF NOT EXISTS run_files (
+                filename TEXT PRIMARY KEY,
+                run_id TEXT NOT NULL REFERENCES runs (run_id)
+            );
+        """)
+        self._conn.commit()
+    
+    def start_run(self, run_id, account, page):
+        self._conn.execute(
+            "INSERT INTO runs (run_id, account, page, started_at) VALUES (?, ?, ?, ?)",
+            (run_id, account, page, datetime.datetime.now().isoformat(timespec='seconds')),
+        )
+        self._conn.commit()
+        return run_id
+    
+    def last_unfinished_run(self, account, page):
+        row = self._conn.execute(
+            "SELECT run_id FROM runs WHERE account = ? AND page = ? AND finished_at IS NULL "
+            "ORDER BY started_at DESC LIMIT 1",
+            (account, page),
+        ).fetchone()
+        return row[0] if row else None
+    
+    def run_info(self, run_id=None):
+        """Retorna (run_id, account, page) de la ejecución indicada o de la más reciente"""
+        if run_id:
+            return self._conn.execute(
+                "SELECT run_id, account, page FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return self._conn.execute(
+            "SELECT run_id, account, page FROM runs ORDER BY started_at DESC LIMIT 1"
+        ).fetchone()
+    
+    def finish_run(self, run_id):
+        self._conn.execute(
+            "UPDATE runs SET finished_at = ? WHERE run_id = ?",
+            (datetime.datetime.now().isoformat(timespec='seconds'), run_id),
+        )
+        self._conn.commit()
+    
+    def done_usernames(self, run_id):
+        return {row[0] for row in self._conn.execute(
+            "SELECT username FROM results WHERE run_id = ?", (run_id,)
+        )}
+    
+    def append(self, run_id, account, username, followers):
+        self._conn.execute(
+            "INSERT INTO results (run_id, seq, account, username, followers) "
+            "VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM results WHERE run_id = ?), ?, ?, ?) "
+            "ON CONFLICT (run_id, username) DO UPDATE SET followers = excluded.followers",
+            (run_id, run_id, account, username, followers),
+        )
+        self._conn.commit()
+    
+    def rows(self, run_id):
+        return ResultRows(self._conn, run_id)
+    
+    # ---------- Histórico ----------
+    def register_file(self, run_id, path):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO run_files (filename, run_id) VALUES (?, ?)",
+            (os.path.basename(path), run_id),
+        )
+        self._conn.commit()
+    
+    def _matching_run(self, account, started_at, results):
+        """
+        Ejecución almacenada a la que corresponde un CSV ({username: seguidores}):
+        la de la misma cuenta, empezada antes del CSV, con exactamente los mismos
+        usernames (y contadores, para no confundir dos días con la misma lista)
+        o, si no hay, la terminada cuya ventana started_at..finished_at contiene
+        el timestamp del CSV (los CSV de --resume llevan el timestamp de la
+        reanudación, no el run_id).
+        """
+        candidates = self._conn.execute(
+            "SELECT run_id FROM runs AS r WHERE account = ? AND started_at <= ? AND "
+            "(SELECT COUNT(*) FROM results WHERE run_id = r.run_id) = ? "
+            "ORDER BY started_at DESC",
+            (account, started_at, len(results)),
+        ).fetchall()
+        for (run_id,) in candidates:
+            stored = dict(self._conn.execute(
+                "SELECT username, followers FROM results WHERE run_id = ?", (run_id,)
+            ))
+            if stored == results:
+                return run_id
+        row = self._conn.execute(
+            "SELECT run_id FROM runs WHERE account = ? AND started_at <= ? AND finished_at >= ? "
+            "ORDER BY started_at DESC LIMIT 1",
+            (account, started_at, started_at),
+        ).fetchone()
+        return row[0] if row else None
+    
+    def ingest_csv(self, path, page="followers"):
+        """
+        Importa un CSV antiguo ({account}_followers_stats_{timestamp}.csv) como
+        ejecución terminada. Retorna el run_id, o None si no aplica o ya estaba
+        (el CSV se asocia entonces a la ejecución existente). Lanza ValueError
+        si el CSV tiene datos inválidos.
+        """
+        filename = os.path.basename(path)
+        match = STATS_CSV_RE.match(filename)
+        if not match:
+            return None
+        if self._conn.execute("SELECT 1 FROM run_files WHERE filename = ?", (filename,)).fetchone():
+            return None
+        
+        file_account, timestamp = match.groups()
+        run_id = timestamp
+        existing = self._conn.execute("SELECT account FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if existing and existing[0] == file_account:
+            # CSV exportado por una ejecución que ya está en el almacén
+            self.register_file(run_id, path)
+            return None
+        if existing:
+            run_id = f"{file_account}:{timestamp}"
+        
+        started_at = datetime.datetime.strptime(timestamp, "%Y%m%d-%H%M%S").isoformat()
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            rows = [
+                (run_id, seq, row[0], row[1], int(row[2]) if row[2] else None)
+                for seq, row in enumerate(reader, 1) if len(row) >= 3
+            ]
+        
+        matching = self._matching_run(file_account, started_at, {row[3]: row[4] for row in rows})
+        if matching:
+            self.register_file(matching, path)
+            return None
+        
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, account, page, started_at, finished_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, file_account, page, started_at, started_at),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO results (run_id, seq, account, username, followers) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT INTO run_files (filename, run_id) VALUES (?, ?)", (filename, run_id)
+            )
+        return run_id
+    
+    def ingest_directory(self, directory, logger=None):
+        """Importa los CSV del directorio que aún no estén en el índice; omite los inválidos"""
+        known = {row[0] for row in self._conn.execute("SELECT filename FROM run_files")}
+        ingested = []
+        for filename in sorted(os.listdir(directory)):
+            if filename in known or not STATS_CSV_RE.match(filename):
+                continue
+            try:
+                run_id = self.ingest_csv(os.path.join(directory, filename))
+            except (ValueError, csv.Error) as e:
+                if logger:
+                    logger.warning(f"⚠ {filename} omitido, datos inválidos: {str(e)}")
+                continue
+            if run_id:
+                ingested.append(run_id)
+        return ingested
+    
+    def finished_runs(self, account, page, limit=2, before=None):
+        """
+        Últimas ejecuciones terminadas de una cuenta, de la más reciente a la
+        más antigua (solo las anteriores a la ejecución `before`, si se indica)
+        """
+        query = ("SELECT run_id FROM runs WHERE account = ? AND page = ? "
+                 "AND finished_at IS NOT NULL")
+        params = [account, page]
+        if before:
+            query += " AND started_at < (SELECT started_at FROM runs WHERE run_id = ?)"
+            params.append(before)
+        return [row[0] for row in self._conn.execute(
+            query + " ORDER BY started_at DESC LIMIT ?", params + [limit]
+        )]
+    
+    def diff(self, old_run, new_run):
+        """
+        Compara dos ejecuciones usando el índice (run_id, username):
+        {"added": [...], "removed": [...], "changed": [(username, antes, después), ...]}
+        """
+        added = [row[0] for row in self._conn.execute(
+            "SELECT username FROM results AS n WHERE n.run_id = ? AND NOT EXISTS ("
+            "  SELECT 1 FROM results AS o WHERE o.run_id = ? AND o.username = n.username"
+            ") ORDER BY n.seq",
+            (new_run, old_run),
+        )]
+        removed = [row[0] for row in self._conn.execute(
+            "SELECT username FROM results AS o WHERE o.run_id = ? AND NOT EXISTS ("
+            "  SELECT 1 FROM results AS n WHERE n.run_id = ? AND n.username = o.username"
+            ") ORDER BY o.seq",
+            (old_run, new_run),
+        )]
+        changed = self._conn.execute(
+            "SELECT n.username, o.followers, n.followers FROM results AS n "
+            "JOIN results AS o ON o.run_id = ? AND o.username = n.username "
+            "WHERE n.run_id = ? AND o.followers IS NOT n.followers ORDER BY n.seq",
+            (old_run, new_run),
+        ).fetchall()
+        return {"added": added, "removed": removed, "changed": changed}
+    
+    def summary(self, run_id):
+        """Retorna (total, exitosos) de una ejecución"""
+        return self._conn.execute(
+            "SELECT COUNT(*), COUNT(followers) FROM results WHERE run_id = ?", (run_id,)
+        ).fetchone()
+    
+    def close(self):
+        self._conn.close()
+
+def open_results_store():
+    path = os.getenv("RESULTS_DB") or os.path.join(
+        config.BASE_DIR, "results.sqlite3"
+    )
+    return ResultsStore(path)
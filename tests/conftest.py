@@ -0,0 +1,53 @@
+import os
+import shutil
+
+import pytest
+
+from igfollowers import config
+from igfollowers.log import Logger
+from igfollowers.replay import FixtureServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@pytest.fixture(scope="session")
+def logger(tmp_path_factory):
+    """Logger real con los logs en un directorio temporal (nada en logs/)"""
+    logger = Logger(log_dir=str(tmp_path_factory.mktemp("logs")), level="WARNING")
+    yield logger
+    logger.close()
+
+
+@pytest.fixture(scope="session")
+def fixture_server():
+    with FixtureServer(FIXTURES_DIR) as server:
+        yield server
+
+
+@pytest.fixture
+def replay_config(fixture_server, monkeypatch):
+    """Apunta la extracción al servidor de fixtures y desactiva las pausas"""
+    monkeypatch.setattr(config, "INSTAGRAM_URL", fixture_server.base_url)
+    monkeypatch.setattr(config, "DELAY_SCALE", 0)
+    return fixture_server
+
+
+@pytest.fixture(scope="session")
+def driver(logger):
+    """
+    Chrome headless. Los tests de navegador se saltan si no hay chromedriver
+    local (CHROMEDRIVER_PATH o en el PATH): nunca se descarga por red.
+    """
+    path = os.getenv("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
+    if not path:
+        pytest.skip("chromedriver no disponible (define CHROMEDRIVER_PATH)")
+    from igfollowers.browser import setup_driver
+    # CHROMEDRIVER_PATH solo mientras se crea el driver: evita la caché y la red
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("CHROMEDRIVER_PATH", path)
+        try:
+            driver = setup_driver(logger, headless=True)
+        except Exception as e:
+            pytest.skip(f"No se pudo iniciar Chrome: {e}")
+    yield driver
+    driver.quit()
@@ -0,0 +1,57 @@
+import csv
+import gzip
+import json
+import importlib.util
+
+import pytest
+
+from igfollowers.export import export_rows, save_results
+
+ROWS = [
+    ["target_account", "alice", 12300],
+    ["target_account", "a_very_long_follower_username_here", None],
+    ["target_account", "john.doe", 1200],
+]
+
+
+def test_export_rows_single_pass(tmp_path):
+    base = str(tmp_path / "out")
+    paths, errors = export_rows(iter(ROWS), base, "target_account", formats=("csv", "txt", "jsonl"))
+    assert errors == {}
+    assert paths == {"csv": base + ".csv", "txt": base + ".txt", "jsonl": base + ".jsonl"}
+
+    with open(paths["csv"], newline='', encoding='utf-8') as f:
+        assert list(csv.reader(f))[1:] == [[str(v) if v is not None else "" for v in row] for row in ROWS]
+    with open(paths["jsonl"], encoding='utf-8') as f:
+        assert [json.loads(line)["Username_Follower"] for line in f] == [row[1] for row in ROWS]
+
+
+def test_txt_banner_matches_table_width(tmp_path):
+    paths, _ = export_rows(iter(ROWS), str(tmp_path / "out"), "target_account", formats=("txt",))
+    with open(paths["txt"], encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    banner, header, separator = lines[0], lines[5], lines[6]
+    assert set(banner) == {"="}
+    assert len(banner) == len(header) == len(separator)
+    assert all(len(line) == len(banner) for line in lines[7:])
+
+
+def test_gzip_export(tmp_path):
+    paths, errors = export_rows(iter(ROWS), str(tmp_path / "out"), "t", formats=("csv",), compress=True)
+    assert errors == {} and paths["csv"].endswith(".csv.gz")
+    with gzip.open(paths["csv"], "rt", encoding="utf-8") as f:
+        assert f.readline().strip() == "Username,Username_Follower,Num_Followers"
+
+
+@pytest.mark.skipif(importlib.util.find_spec("pyarrow") is not None, reason="pyarrow instalado")
+def test_skipped_parquet_is_reported(tmp_path):
+    paths, errors = export_rows(iter(ROWS), str(tmp_path / "out"), "t", formats=("csv", "parquet"))
+    assert set(paths) == {"csv"}
+    assert "pyarrow" in errors["parquet"]
+
+
+def test_save_results_uses_explicit_base_path(tmp_path, monkeypatch, logger):
+    monkeypatch.setenv("EXPORT_FORMATS", "csv,jsonl")
+    base = str(tmp_path / "target_account_followers_stats_20250101-100000")
+    paths = save_results(iter(ROWS), base, "target_account", logger)
+    assert paths == {"csv": base + ".csv", "jsonl": base + ".jsonl"}
@@ -0,0 +1,81 @@
+from igfollowers import config
+from igfollowers.extraction import _fetch_follower_count, parse_profile_snapshot, username_from_href
+from igfollowers.metrics import metrics
+
+
+def snapshot(**fields):
+    return dict({"exists": True, "followersText": None, "followersTitle": None,
+                 "followingText": None, "postsText": None, "bodyText": None}, **fields)
+
+
+def test_snapshot_prefers_link_text():
+    profile = parse_profile_snapshot(snapshot(
+        followersText="12.3K followers", followersTitle="12,345",
+        followingText="300 following", postsText="1,234 posts",
+    ))
+    assert profile == {"exists": True, "followers": 12300, "following": 300,
+                       "posts": 1234, "source": "link"}
+
+
+def test_snapshot_falls_back_to_title():
+    profile = parse_profile_snapshot(snapshot(followersText="Followers", followersTitle="12,345"))
+    assert (profile["followers"], profile["source"]) == (12345, "title")
+
+
+def test_snapshot_falls_back_to_body_when_link_is_unparsable():
+    profile = parse_profile_snapshot(snapshot(
+        followersText="Followers", bodyText="nadia\n42 posts\n5,432 followers · 210 following",
+    ))
+    assert (profile["followers"], profile["source"]) == (5432, "body")
+
+
+def test_snapshot_without_any_count():
+    profile = parse_profile_snapshot(snapshot(followersText="Followers"))
+    assert profile["exists"] and profile["followers"] is None and profile["source"] is None
+
+
+def test_missing_profile():
+    assert parse_profile_snapshot({"exists": False})["exists"] is False
+    assert parse_profile_snapshot(None)["exists"] is False
+
+
+def test_username_from_href():
+    assert username_from_href("/john.doe/") == "john.doe"
+    assert username_from_href("https://www.instagram.com/alice/followers/") == "alice"
+    assert username_from_href("https://example.com/alice/") is None
+    assert username_from_href("") is None
+
+
+class SnapshotDriver:
+    """Driver mínimo: la página "cargada" devuelve siempre el mismo snapshot"""
+    def __init__(self, snapshot, body_text=None):
+        self.snapshot = snapshot
+        self.body_text = body_text
+
+    def get(self, url):
+        pass
+
+    def execute_async_script(self, script, *args):
+        return dict(self.snapshot)
+
+    def execute_script(self, script, *args):
+        return self.body_text
+
+
+def test_profile_wait_timeout_is_counted(monkeypatch, logger):
+    monkeypatch.setattr(config, "DELAY_SCALE", 0)
+    before = metrics.counters["selector_timeouts.profile"]
+    driver = SnapshotDriver(snapshot(timedOut=True, bodyText="5,432 followers"))
+    assert _fetch_follower_count(driver, "nadia", logger) == (5432, "ok")
+    assert metrics.counters["selector_timeouts.profile"] == before + 1
+
+    driver = SnapshotDriver(snapshot(followersText="1,234 followers", timedOut=False))
+    assert _fetch_follower_count(driver, "alice", logger) == (1234, "ok")
+    assert metrics.counters["selector_timeouts.profile"] == before + 1
+
+
+def test_unparsable_link_fetches_body_text(monkeypatch, logger):
+    monkeypatch.setattr(config, "DELAY_SCALE", 0)
+    driver = SnapshotDriver(snapshot(followersText="Since 2024", timedOut=False),
+                            body_text="x\n7,001 followers")
+    assert _fetch_follower_count(driver, "odd", logger) == (7001, "ok")
@@ -0,0 +1,14 @@
+import pytest
+
+from igfollowers.log import Logger
+
+
+def test_level_is_case_insensitive(logger):
+    logger.set_level("info")
+    assert logger.is_enabled("INFO") and not logger.is_enabled("DEBUG")
+    logger.set_level("WARNING")
+
+
+def test_unknown_level_lists_valid_levels(tmp_path):
+    with pytest.raises(ValueError, match="DEBUG, INFO, SUCCESS, WARNING, ERROR"):
+        Logger(log_dir=str(tmp_path), level="trace")
@@ -0,0 +1,37 @@
+import pytest
+
+from igfollowers.metrics import RunMetrics, _percentile
+
+
+@pytest.mark.parametrize("values, pct, expected", [
+    ([1, 2, 3, 4, 5], 50, 3),
+    (list(range(1, 10)), 50, 5),
+    ([1, 2, 3, 4], 50, 2),
+    (list(range(1, 101)), 95, 95),
+    ([5, 1, 3], 100, 5),
+    ([5, 1, 3], 0, 1),
+    ([7], 95, 7),
+    ([], 50, 0.0),
+])
+def test_percentile_nearest_rank(values, pct, expected):
+    assert _percentile(values, pct) == expected
+
+
+def test_reset_clears_spans_counters_and_clock():
+    metrics = RunMetrics()
+
+    @metrics.timed("phase")
+    def work():
+        return 42
+
+    assert work() == 42
+    metrics.incr("timeouts")
+    started = metrics.started
+    metrics.reset()
+    assert metrics.summary()["phases"] == {}
+    assert metrics.summary()["counters"] == {}
+    assert metrics.started >= started
+
+    # Los decoradores siguen registrando en la misma instancia tras reset()
+    work()
+    assert metrics.summary()["phases"]["phase"]["count"] == 1
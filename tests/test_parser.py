@@ -0,0 +1,109 @@
+import pytest
+
+from igfollowers.counts import (
+    parse_follower_count,
+    parse_count,
+    parse_follower_counts,
+    find_follower_count,
+    find_follower_counts,
+    _legacy_parse_follower_count,
+    _legacy_find_follower_count,
+)
+
+# Corpus de referencia del parser: (texto, resultado esperado)
+PARSER_SAMPLES = [
+    ("1,234 followers", 1234),
+    ("1.234 seguidores", 1234),
+    ("1,234,567 followers", 1234567),
+    ("1.234.567 seguidores", 1234567),
+    ("1,2 mil seguidores", 1200),
+    ("12,5 mil seguidores", 12500),
+    ("12.5K followers", 12500),
+    ("10K followers", 10000),
+    ("1.2M followers", 1200000),
+    ("3M followers", 3000000),
+    ("3 mill. seguidores", 3000000),
+    ("2,5 millones de seguidores", 2500000),
+    ("1,234.5K followers", 1234500),
+    ("1 follower", 1),
+    ("0 followers", 0),
+    ("987 followers", 987),
+    ("1\u00a0234 followers", 1234),
+    ("1\u202f234\u202f567 followers", 1234567),
+    ("1 234 seguidores", 1234),
+    ("mike_k 150 followers", 150),
+    ("1,234", 1234),
+    ("12.5K", 12500),
+    ("Posts 1,234 following", None),
+    ("", None),
+    (None, None),
+    ("followers", None),
+    # Separador + 3 dígitos con k/mil: miles, no decimal
+    ("1,000K followers", 1000000),
+    ("1.234 mil seguidores", 1234000),
+    ("1.234K", 1234000),
+    # Con M/B el mismo patrón es decimal
+    ("1.234M followers", 1234000),
+    ("2,500 millones de seguidores", 2500000),
+    ("1.5B followers", 1500000000),
+]
+
+
+@pytest.mark.parametrize("text, expected", PARSER_SAMPLES)
+def test_parse_follower_count(text, expected):
+    assert parse_follower_count(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("123 posts", 123),
+    ("1,2 mil seguidos", 1200),
+    ("1.234 mil seguidos", 1234000),
+    ("Posts 1,234 following", 1234),
+    ("12.5K", 12500),
+    ("no numbers", None),
+    ("", None),
+])
+def test_parse_count(text, expected):
+    assert parse_count(text) == expected
+
+
+def test_find_follower_count_skips_other_counters():
+    page_text = "mike_k\n1,234 posts\n12,5 mil seguidores\n300 seguidos"
+    assert find_follower_count(page_text) == 12500
+
+
+def test_find_follower_count_does_not_cross_lines():
+    assert find_follower_count("Posts 1,234\nfollowers") is None
+    assert find_follower_count("") is None
+
+
+def test_batch_helpers_match_single_versions():
+    texts = [text for text, _ in PARSER_SAMPLES]
+    assert parse_follower_counts(texts) == [expected for _, expected in PARSER_SAMPLES]
+    pages = ["a\n1,234 followers", "nada", "3M followers\n10 followers"]
+    assert find_follower_counts(pages) == [1234, None, 3000000]
+
+
+# Coste del parser frente a la implementación anterior (mismo grupo = misma tabla)
+@pytest.mark.benchmark(group="parser-text")
+def test_parser_cost_per_text(benchmark):
+    texts = [text for text, _ in PARSER_SAMPLES]
+    benchmark(parse_follower_counts, texts)
+
+
+@pytest.mark.benchmark(group="parser-text")
+def test_legacy_parser_cost_per_text(benchmark):
+    texts = [text for text, _ in PARSER_SAMPLES]
+    benchmark(lambda: [_legacy_parse_follower_count(text) for text in texts])
+
+
+@pytest.mark.benchmark(group="parser-page")
+def test_parser_cost_per_page(benchmark):
+    page_text = "\n".join(text for text, _ in PARSER_SAMPLES if text)
+    assert benchmark(find_follower_count, page_text) == 1234
+
+
+@pytest.mark.benchmark(group="parser-page")
+def test_legacy_parser_cost_per_page(benchmark):
+    page_text = "\n".join(text for text, _ in PARSER_SAMPLES if text)
+    benchmark(_legacy_find_follower_count, page_text)
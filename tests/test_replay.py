@@ -0,0 +1,85 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from igfollowers.extraction import (
+    find_login_fields,
+    get_follower_count_from_profile,
+    get_followers_list,
+)
+from igfollowers.replay import fixture_profiles, replay_login
+
+from conftest import FIXTURES_DIR
+
+EXPECTED_FOLLOWERS = {
+    "alice": 12300,
+    "john.doe": 1200,
+    "mike_k": 3000000,
+    "nadia": 5432,
+    "recycled_account": 2048,
+    "target_account": 2048,
+}
+
+
+def test_fixture_profiles_keep_dotted_usernames(tmp_path):
+    profiles = tmp_path / "profiles"
+    profiles.mkdir()
+    for name in ("john.doe.html", "a.b.c.html.gz", "plain.html", "notes.txt"):
+        (profiles / name).write_bytes(b"")
+    assert fixture_profiles(str(tmp_path)) == ["a.b.c", "john.doe", "plain"]
+    assert fixture_profiles(FIXTURES_DIR) == sorted(EXPECTED_FOLLOWERS)
+
+
+def test_fixture_server_routes(fixture_server):
+    def get(path):
+        try:
+            with urllib.request.urlopen(fixture_server.base_url + path) as response:
+                return response.status, response.read().decode("utf-8")
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode("utf-8")
+
+    assert "name=\"username\"" in get("/accounts/login/")[1]
+    assert "/john.doe/followers/" in get("/john.doe/")[1]
+    assert "follower_" in get("/target_account/followers/")[1]
+    status, body = get("/nobody/")
+    assert status == 404 and "Sorry" in body
+
+
+def test_login_replay(driver, replay_config, logger):
+    from selenium.webdriver.common.by import By
+    assert replay_login(driver, logger)
+
+    strategies = [{
+        "name": "Por atributo 'name'",
+        "username": (By.CSS_SELECTOR, "input[name='username']"),
+        "password": (By.CSS_SELECTOR, "input[name='password']"),
+    }]
+    username_input, password_input = find_login_fields(driver, strategies, logger)
+    assert username_input.get_attribute("value") == "replay_user"
+    assert password_input.get_attribute("type") == "password"
+
+
+@pytest.mark.parametrize("username", sorted(EXPECTED_FOLLOWERS))
+def test_profile_latency(benchmark, driver, replay_config, logger, username):
+    count = benchmark.pedantic(
+        get_follower_count_from_profile, args=(driver, username, logger), rounds=5
+    )
+    assert count == EXPECTED_FOLLOWERS[username]
+
+
+def test_missing_profile(driver, replay_config, logger):
+    assert get_follower_count_from_profile(driver, "nobody", logger) is None
+
+
+def test_list_throughput_per_100_users(benchmark, driver, replay_config, logger):
+    users = benchmark.pedantic(
+        get_followers_list, args=(driver, "target_account", "followers", 100, logger), rounds=3
+    )
+    assert users == [f"follower_{i:03d}" for i in range(1, 101)]
+
+
+def test_list_with_recycled_nodes(driver, replay_config, logger):
+    # Los nodos <a> se reutilizan con otro href: cada href nuevo cuenta
+    users = get_followers_list(driver, "recycled_account", "followers", 100, logger)
+    assert users == [f"follower_{i:03d}" for i in range(1, 101)]
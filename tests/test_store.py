@@ -0,0 +1,135 @@
+import pytest
+
+from igfollowers.store import ResultsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.sqlite3"))
+    yield store
+    store.close()
+
+
+def write_csv(directory, name, rows):
+    path = directory / name
+    lines = ["Username,Username_Follower,Num_Followers"]
+    lines += [",".join("" if v is None else str(v) for v in row) for row in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def stored_run(store, run_id, rows, account="acc", started_at=None, finished_at=None):
+    store.start_run(run_id, account, "followers")
+    for _, username, followers in rows:
+        store.append(run_id, account, username, followers)
+    store.finish_run(run_id)
+    # start_run/finish_run usan la hora actual; los tests fijan la ventana
+    store._conn.execute(
+        "UPDATE runs SET started_at = ?, finished_at = COALESCE(?, finished_at) WHERE run_id = ?",
+        (started_at, finished_at, run_id),
+    )
+
+
+ROWS = [["acc", "alice", 100], ["acc", "bob", None], ["acc", "john.doe", 5]]
+
+
+def test_ingest_legacy_csv(store, tmp_path):
+    path = write_csv(tmp_path, "acc_followers_stats_20250101-100000.csv", ROWS)
+    assert store.ingest_csv(path) == "20250101-100000"
+    assert list(store.rows("20250101-100000")) == ROWS
+    assert store.ingest_csv(path) is None
+
+
+def test_resume_csv_matches_stored_run(store, tmp_path):
+    # El CSV de una ejecución reanudada lleva el timestamp de la reanudación
+    stored_run(store, "20250101-100000", ROWS,
+               started_at="2025-01-01T10:00:00", finished_at="2025-01-01T11:00:00")
+    write_csv(tmp_path, "acc_followers_stats_20250102-090000.csv", ROWS)
+    assert store.ingest_directory(str(tmp_path)) == []
+    assert store.finished_runs("acc", "followers", limit=5) == ["20250101-100000"]
+
+
+def test_csv_inside_run_window_is_not_ingested(store, tmp_path):
+    stored_run(store, "20250101-100000", ROWS,
+               started_at="2025-01-01T10:00:00", finished_at="2025-01-01T12:00:00")
+    write_csv(tmp_path, "acc_followers_stats_20250101-113000.csv", ROWS[:2])
+    assert store.ingest_directory(str(tmp_path)) == []
+
+
+def test_same_users_on_another_day_is_a_new_run(store, tmp_path):
+    stored_run(store, "20250101-100000", ROWS,
+               started_at="2025-01-01T10:00:00", finished_at="2025-01-01T12:00:00")
+    changed = [["acc", "alice", 120], ["acc", "bob", None], ["acc", "john.doe", 5]]
+    write_csv(tmp_path, "acc_followers_stats_20250105-100000.csv", changed)
+    assert store.ingest_directory(str(tmp_path)) == ["20250105-100000"]
+
+
+def test_invalid_csv_is_skipped(store, tmp_path, logger):
+    write_csv(tmp_path, "acc_followers_stats_20250101-100000.csv", [["acc", "alice", "many"]])
+    write_csv(tmp_path, "acc_followers_stats_20250102-100000.csv", ROWS)
+    assert store.ingest_directory(str(tmp_path), logger) == ["20250102-100000"]
+
+
+def test_diff_added_removed_changed(store):
+    stored_run(store, "old", [["acc", "alice", 100], ["acc", "bob", None], ["acc", "carol", 7],
+                              ["acc", "dave", 50]], started_at="2025-01-01T10:00:00")
+    stored_run(store, "new", [["acc", "alice", 120], ["acc", "bob", 30], ["acc", "erin", 1],
+                              ["acc", "dave", 50], ["acc", "frank", None]],
+               started_at="2025-01-02T10:00:00")
+    assert store.diff("old", "new") == {
+        "added": ["erin", "frank"],
+        "removed": ["carol"],
+        "changed": [("alice", 100, 120), ("bob", None, 30)],
+    }
+
+
+def test_diff_count_to_none_is_a_change(store):
+    stored_run(store, "old", [["acc", "alice", 100]], started_at="2025-01-01T10:00:00")
+    stored_run(store, "new", [["acc", "alice", None]], started_at="2025-01-02T10:00:00")
+    assert store.diff("old", "new")["changed"] == [("alice", 100, None)]
+
+
+def test_finished_runs_defaults_to_last_two(store):
+    for day in (1, 2, 3):
+        stored_run(store, f"run{day}", ROWS, started_at=f"2025-01-0{day}T10:00:00")
+    stored_run(store, "other", ROWS, account="other", started_at="2025-01-04T10:00:00")
+    store.start_run("unfinished", "acc", "followers")
+    
+    assert store.finished_runs("acc", "followers") == ["run3", "run2"]
+    assert store.finished_runs("acc", "followers", limit=1, before="run3") == ["run2"]
+    assert store.finished_runs("acc", "followers", before="run1") == []
+    assert store.finished_runs("acc", "following") == []
+
+
+@pytest.fixture
+def diff_store(tmp_path, monkeypatch):
+    """results.sqlite3 temporal para el subcomando diff (sin CSV que indexar)"""
+    from igfollowers import config
+    path = str(tmp_path / "results.sqlite3")
+    monkeypatch.setenv("RESULTS_DB", path)
+    monkeypatch.setattr(config, "BASE_DIR", str(tmp_path))
+    store = ResultsStore(path)
+    stored_run(store, "old", [["acc", "alice", 100]], started_at="2025-01-01T10:00:00")
+    stored_run(store, "new", [["acc", "alice", 120]], started_at="2025-01-02T10:00:00")
+    stored_run(store, "elsewhere", [["other", "alice", 1]], account="other",
+               started_at="2025-01-03T10:00:00")
+    store._conn.commit()
+    store.close()
+
+
+@pytest.mark.parametrize("old_run, new_run, ok", [
+    (None, None, True),
+    ("old", "new", True),
+    ("typo_run", None, False),
+    ("old", "typo_run", False),
+    ("elsewhere", "new", False),
+    ("old", "elsewhere", False),
+])
+def test_show_diff_validates_run_ids(diff_store, logger, old_run, new_run, ok):
+    from instagram_followers import show_diff
+    assert show_diff("acc", "followers", old_run, new_run, 10, logger) is ok
+
+
+def test_show_diff_rejects_other_page(diff_store, logger):
+    from instagram_followers import show_diff
+    assert show_diff("acc", "following", "old", "new", 10, logger) is False